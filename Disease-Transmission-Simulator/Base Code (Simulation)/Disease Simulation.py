@@ -8,10 +8,37 @@ masks, social isolation), and natural immunity buildup.
 Author: pospsl
 """
 
-from random import random, sample, randint, seed
-from os.path import isfile
+from random import random, sample, seed
+from os.path import isfile, getmtime
 from os import access, R_OK
-import matplotlib.pyplot as plt
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from multiprocessing import Pool
+from types import MappingProxyType
+from zlib import crc32
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Disease state encoding (uint8, wider only if di+de+2 > 255): infected
+# agents count down from di+de+2 to LAST_DAY, then recover or become
+# susceptible again
+RECOVERED = 0
+SUSCEPTIBLE = 1
+LAST_DAY = 2
+
+# Protection levels (uint8): probability p is stored as round(p * PROTECTION_SCALE)
+PROTECTION_SCALE = 255
+# Chance of slipping past a protection, indexed by its level
+ESCAPE = (1 - np.arange(PROTECTION_SCALE + 1) / PROTECTION_SCALE).astype(np.float32)
 
 
 def signed():
@@ -19,6 +46,35 @@ def signed():
     return ["pospsl"]
 
 
+def quantize(p):
+    """
+    Convert probabilities to protection levels.
+    
+    Args:
+        p (float or ndarray): Probability (0.0-1.0)
+        
+    Returns:
+        ndarray[uint8]: Level round(p * PROTECTION_SCALE)
+    """
+    return np.rint(np.asarray(p) * PROTECTION_SCALE).astype(np.uint8)
+
+
+def seedInt(value):
+    """
+    Turn a configured seed into an integer seed.
+    
+    Integers are used as-is; any other value (e.g. 1.5 or a tuple) is
+    hashed stably from its repr, so runs stay reproducible across processes.
+    
+    Args:
+        value (int, float or tuple): Seed from the configuration
+        
+    Returns:
+        int: Seed for random.seed(); reduce it modulo 2**32 for NumPy
+    """
+    return value if isinstance(value, int) else crc32(repr(value).encode())
+
+
 def flip(p=0.5):
     """
     Flip a weighted coin.
@@ -36,7 +92,7 @@ def flip(p=0.5):
     return random() <= p
 
 
-def binnedSample(k, N):
+def binnedSample(k, N, starts=None):
     """
     Sample random integers from binned populations without replacement.
     
@@ -48,6 +104,8 @@ def binnedSample(k, N):
     Args:
         k (int or tuple): Number of samples (or tuple of counts per bin)
         N (int or tuple): Population size (or tuple of bin sizes)
+        starts (tuple, optional): Precomputed bin boundaries (0, N[0], N[0]+N[1], ...),
+            as cached by readConfig
         
     Returns:
         set: Random integers sampled according to the specified mode
@@ -75,14 +133,14 @@ def binnedSample(k, N):
     
     # Mode 3: Sample specified amounts from each bin
     elif type(k) is tuple and type(N) is tuple and len(k) == len(N):
+        # Bin boundaries (each bin builds on the previous ones), unless precomputed
+        if starts is None:
+            starts = tuple(accumulate([0] + list(N)))
         samples = []
         # Iterate through each bin
         for i in range(len(k)):
-            # Calculate the range for this bin (builds on previous bins)
-            bin_start = sum(N[0:i+1]) - N[i]
-            bin_end = sum(N[0:i+1])
             # Sample k[i] values from this bin's range
-            samples += sample(range(bin_start, bin_end), k[i])
+            samples += sample(range(starts[i], starts[i+1]), k[i])
         return set(samples)
     
     else:
@@ -90,18 +148,39 @@ def binnedSample(k, N):
         return set()
 
 
+@dataclass
+class Population:
+    """
+    Agent population stored as parallel NumPy arrays, one entry per agent.
+
+    Attributes:
+        state (ndarray[uint]): Disease state (0=recovered, 1=susceptible, >1=infected countdown),
+            uint8 unless di+de+2 > 255
+        vaccine (ndarray[uint8]): Vaccine effectiveness (0 if unvaccinated)
+        mask (ndarray[uint8]): Masking effectiveness (0 if not masking)
+        natural_immunity (ndarray[uint8]): Immunity from prior infections
+        sociso (ndarray[uint8]): Social isolation adherence (set when infected)
+        type (ndarray[int8]): Subgroup identifier (all 0 if N is an int)
+        
+    Protections are probabilities quantized to levels 0-PROTECTION_SCALE
+    (see quantize); 256 levels are plenty for a probability and keep the
+    arrays a quarter the size of float32.
+    """
+    state: np.ndarray
+    vaccine: np.ndarray
+    mask: np.ndarray
+    natural_immunity: np.ndarray
+    sociso: np.ndarray
+    type: np.ndarray
+
+    def __len__(self):
+        return len(self.state)
+
+
 def newPop(config):
     """
     Create a new population of agents with initial disease states.
     
-    Each agent is represented as a dictionary with keys:
-    - 'state': Disease state (-1=susceptible, 0=recovered, >0=infected countdown)
-    - 'vaccine': Vaccine effectiveness (0.0-1.0, 0 if unvaccinated)
-    - 'mask': Masking effectiveness (0.0-1.0, 0 if not masking)
-    - 'natural_immunity': Immunity from prior infections (0.0-1.0)
-    - 'type': Subgroup identifier (only if N is a tuple)
-    - 'sociso': Social isolation adherence (0.0-1.0, set when infected)
-    
     Args:
         config (dict): Configuration dictionary containing:
             - N (int or tuple): Population size(s)
@@ -114,66 +193,46 @@ def newPop(config):
             - de (int): Days in exposed state
             
     Returns:
-        tuple: (population, infected_set) where:
-            - population is a tuple of agent dictionaries
-            - infected_set is a set of indices of initially infected agents
+        tuple: (population, infected) where:
+            - population is a Population of per-agent arrays
+            - infected is a boolean array marking initially infected agents
     """
-    def helper(p):
-        """
-        Return random effectiveness value with probability p, else 0.
-        
-        This helper implements a choice-then-effectiveness pattern:
-        with probability p, the agent adopts the behavior and gets
-        a random effectiveness (0-1); otherwise they don't adopt it (0).
-        """
-        return (flip(p) and random()) or 0
-
-    # Create population based on structure (homogeneous or subgroups)
-    if type(config['N']) is tuple:
-        # Diverse population with subgroups
-        pop = tuple([
-            {
-                'state': -1,
-                'vaccine': helper(config['vp']),
-                'mask': helper(config['mp']),
-                'natural_immunity': 0.0,
-                'type': subgroup_id
-            }
-            for subgroup_id in range(len(config['N']))
-            for _ in range(config['N'][subgroup_id])
-        ])
-    else:
-        # Homogeneous population
-        pop = tuple([
-            {
-                'state': -1,
-                'vaccine': helper(config['vp']),
-                'mask': helper(config['mp']),
-                'natural_immunity': 0.0
-            }
-            for _ in range(config['N'])
-        ])
+    # Subgroup sizes (a homogeneous population is a single subgroup)
+    sizes = config['N'] if type(config['N']) is tuple else (config['N'],)
+    n = sum(sizes)
+
+    # Behaviors follow a choice-then-effectiveness pattern: with probability
+    # p the agent adopts the behavior and gets a random effectiveness (0-1),
+    # otherwise they don't adopt it (0)
+    pop = Population(
+        # uint8 unless the infection countdown needs more (di + de > 253)
+        state=np.full(n, SUSCEPTIBLE, dtype=np.min_scalar_type(config['di'] + config['de'] + LAST_DAY)),
+        vaccine=quantize(np.random.random(n) * (np.random.random(n) < config['vp'])),
+        mask=quantize(np.random.random(n) * (np.random.random(n) < config['mp'])),
+        natural_immunity=np.zeros(n, dtype=np.uint8),
+        sociso=np.zeros(n, dtype=np.uint8),
+        type=np.repeat(np.arange(len(sizes), dtype=np.int8), sizes)
+    )
 
     # Select initial infected agents using binned sampling
-    inf = binnedSample(config['I'], config['N'])
-    
-    # Set initial infected states and social isolation
-    for i in inf:
-        # Set infection countdown (will be decremented on first update)
-        pop[i]['state'] = config['di'] + config['de'] + 1
-        
-        # Determine social isolation behavior
-        if flip(config['ap']):
-            # Asymptomatic agents don't know to isolate
-            pop[i]['sociso'] = 0.0
-        else:
-            # Symptomatic agents may choose to isolate
-            pop[i]['sociso'] = helper(config['ip'])
+    initial = np.fromiter(binnedSample(config['I'], config['N'], config['_bin_starts']),
+                          dtype=np.intp)
+    inf = np.zeros(n, dtype=bool)
+    inf[initial] = True
+
+    # Set infection countdown (will be decremented on first update)
+    pop.state[initial] = config['di'] + config['de'] + LAST_DAY
+
+    # Determine social isolation behavior: asymptomatic agents don't know
+    # to isolate, symptomatic agents may choose to isolate
+    k = len(initial)
+    symptomatic = np.random.random(k) > config['ap']
+    pop.sociso[initial] = quantize(symptomatic * np.random.random(k) * (np.random.random(k) < config['ip']))
 
     return (pop, inf)
 
 
-def update(pop, inf, config):
+def update(pop, inf, rp):
     """
     Update agent disease states at the beginning of each simulation day.
     
@@ -183,56 +242,179 @@ def update(pop, inf, config):
     3. Grants natural immunity to agents who become susceptible after infection
     
     Args:
-        pop (tuple): Population of agent dictionaries
-        inf (set): Set of currently infected agent indices
-        config (dict): Configuration with 'rp' (recovery probability)
+        pop (Population): Population of agent arrays
+        inf (ndarray[bool]): Mask of currently infected agents
+        rp (float): Recovery probability
         
     Returns:
-        set: Updated set of currently infected agent indices
+        ndarray[bool]: Updated mask of currently infected agents (modified in place)
         
     Notes:
-        Agents with state=1 (end of infection) either:
-        - Recover with full immunity (state=0) with probability rp
-        - Become susceptible again (state=-1) with probability (1-rp),
+        Agents with state=LAST_DAY (end of infection) either:
+        - Recover with full immunity (RECOVERED) with probability rp
+        - Become SUSCEPTIBLE again with probability (1-rp),
           but gain natural immunity from the infection
     """
-    drop = set()  # Agents who recover or become susceptible this round
-    
-    for i in inf:
-        if pop[i]['state'] == 1:
-            # Agent at end of infectious period
-            if flip(1 - config['rp']):
-                # Become susceptible again (reinfection possible)
-                pop[i]['state'] = -1
-                # Grant natural immunity from this infection
-                # Each infection adds 0-0.5 immunity, capped at 0.9
-                pop[i]['natural_immunity'] = min(
-                    0.9,
-                    pop[i]['natural_immunity'] + random() * 0.5
-                )
-            else:
-                # Recover with full immunity
-                pop[i]['state'] = 0
-            
-            drop.add(i)
-            
-        elif pop[i]['state'] > 0:
-            # Still infectious, decrement countdown
-            pop[i]['state'] -= 1
-    
+    # Agents who recover or become susceptible this round
+    end_idx = np.flatnonzero(pop.state == LAST_DAY)
+
+    # Still infectious, decrement countdown in one pass over the array
+    np.subtract(pop.state, 1, out=pop.state, where=pop.state > LAST_DAY)
+
+    # Agents at end of infectious period: one coin per agent
+    resusceptible = np.random.random(len(end_idx)) <= 1 - rp
+
+    # Become susceptible again (reinfection possible)
+    back = end_idx[resusceptible]
+    pop.state[back] = SUSCEPTIBLE
+    # Grant natural immunity from this infection
+    # Each infection adds 0-0.5 immunity, capped at 0.9
+    pop.natural_immunity[back] = np.minimum(
+        quantize(0.9),
+        pop.natural_immunity[back].astype(np.uint16) + quantize(np.random.random(len(back)) * 0.5)
+    )
+
+    # Recover with full immunity
+    pop.state[end_idx[~resusceptible]] = RECOVERED
+
     # Remove recovered/susceptible agents from infected set
-    return inf - drop
+    inf[end_idx] = False
+    return inf
+
+
+@njit(cache=True)
+def floydSample(k, n, u, out, first):
+    """
+    Sample k distinct integers from range(n) with Floyd's algorithm.
+    
+    Uses exactly one uniform draw per sample (no rejection), so the cost is
+    O(k^2) comparisons regardless of n; k is a day's contacts, so tiny.
+    
+    Args:
+        k (int): Number of samples (k <= n)
+        n (int): Population size
+        u (ndarray[float]): At least k uniform draws in [0, 1)
+        out (ndarray[int]): Buffer receiving the samples
+        first (int): Position in out of the first sample
+    """
+    for c in range(k):
+        j = n - k + c
+        t = int(u[c] * (j + 1))
+        # t is taken already: j itself can't be, so use it instead
+        for d in range(first, first + c):
+            if out[d] == t:
+                t = j
+                break
+        out[first + c] = t
+
+
+@njit(cache=True)
+def drawContacts(per_group, bin_starts, u):
+    """
+    Draw every contact made today, without replacement within each subgroup.
+    
+    Args:
+        per_group (ndarray[int]): (sources, G) contacts each source agent
+            makes with each subgroup today
+        bin_starts (ndarray[int]): First agent index of each subgroup, plus N
+        u (ndarray[float]): One uniform draw per contact (per_group.sum() total)
+        
+    Returns:
+        ndarray[int]: Contacted agents, grouped by source agent in order
+    """
+    contacts = np.empty(len(u), np.int64)
+    first = 0
+    for k in range(per_group.shape[0]):
+        for g in range(per_group.shape[1]):
+            count = per_group[k, g]
+            floydSample(count, bin_starts[g + 1] - bin_starts[g],
+                        u[first:first + count], contacts, first)
+            contacts[first:first + count] += bin_starts[g]
+            first += count
+    return contacts
+
+
+# Prefer the prebuilt Cython drawContacts (disease_core.pyx, built with
+# `cythonize -i disease_core.pyx`): it has no JIT warmup in each new process
+try:
+    from disease_core import drawContacts
+except ImportError:
+    pass
+
+
+def transmit(pop, spreading, per_group, bin_starts, tpe, tpi, di, de, ap, ip):
+    """
+    Run one day of transmission as a single pass over all contacts.
+    
+    Builds the flat list of (source, target) contact pairs for the day,
+    then evaluates every transmission attempt at once. An attempt on a
+    susceptible target succeeds with probability
+    
+        tp * (1 - vaccine) * (1 - mask) * (1 - natural_immunity)
+    
+    which is the chance that the transmission flip succeeds and each of the
+    target's independent protection flips fails. A target hit by several
+    sources is infected once, by the first of them.
+    
+    Args:
+        pop (Population): Population of agent arrays (updated in place)
+        spreading (ndarray[int]): Infected agents able to spread today
+            (not masked or isolated)
+        per_group (ndarray[int]): (len(spreading), G) contacts each source
+            makes with each subgroup today
+        bin_starts (ndarray[int]): First agent index of each subgroup, plus N
+        tpe, tpi (float): Exposed/infected transmission probabilities
+        di, de (int): Days in infected/exposed state
+        ap, ip (float): Asymptomatic/isolation probabilities
+        
+    Returns:
+        tuple: (targets, sources) arrays of newly infected agents and
+        the agents that infected them
+    """
+    # Flat (source, target) contact pairs
+    n_contacts = per_group.sum(axis=1)
+    src = np.repeat(spreading, n_contacts)
+    dst = drawContacts(per_group, bin_starts, np.random.random(len(src)))
+
+    # Only susceptible targets can be infected; drop the rest (the cheapest
+    # check) before gathering any protections
+    open_ = pop.state[dst] == SUSCEPTIBLE
+    src, dst = src[open_], dst[open_]
+
+    # Exposed sources transmit with tpe, infected sources with tpi, and the
+    # target's protections combine into a single flip (tpe/tpi may parse as
+    # ints, e.g. tpe: 1, so force a float array before scaling it in place)
+    p_infect = np.where(pop.state[src] > di + 1, float(tpe), float(tpi))
+    p_infect *= (ESCAPE[pop.vaccine[dst]] * ESCAPE[pop.mask[dst]] *
+                 ESCAPE[pop.natural_immunity[dst]])
+    hit = np.random.random(len(dst)) < p_infect
+
+    # First source to reach each target infects it
+    targets, first = np.unique(dst[hit], return_index=True)
+    sources = src[hit][first]
+
+    # New infections occur
+    pop.state[targets] = di + de + LAST_DAY
+    # Asymptomatic agents won't isolate; symptomatic ones may choose to
+    k = len(targets)
+    symptomatic = np.random.random(k) > ap
+    pop.sociso[targets] = quantize(symptomatic * np.random.random(k) * (np.random.random(k) < ip))
+
+    return targets, sources
 
 
 def readConfig(cfile):
     """
     Read simulation configuration from file.
     
+    Parsed configurations are cached per file and modification time, so
+    repeated runs (e.g., simMany replicas) don't re-read an unchanged file.
+    
     Args:
         cfile (str): Path to configuration file
         
     Returns:
-        dict: Configuration dictionary with all parameters
+        mappingproxy: Read-only configuration dictionary with all parameters
         
     Configuration File Format:
         - Lines starting with '#' are comments
@@ -245,28 +427,34 @@ def readConfig(cfile):
         - N=100, I=1, m=4, de=3, di=5
         - tpe=0.01, tpi=0.02, rp=0.5
         - vp=0.9, mp=0.3, ap=0.3, ip=0.4
-        - max=100, verbose=False
+        - max=100, verbose=False, seed=None (unseeded)
     """
+    readable = isfile(cfile) and access(cfile, R_OK)
+    return _readConfigCached(cfile, getmtime(cfile) if readable else None)
+
+
+@lru_cache(maxsize=8)
+def _readConfigCached(cfile, mtime):
+    """Parse cfile for readConfig; mtime is part of the cache key only."""
     def cast(value):
         """Convert string value to appropriate type (bool, int, float, or tuple)."""
         # Check for boolean
         if isinstance(value, str) and value.lower() in ("true", "false"):
             return value.lower().capitalize() == 'True'
         
-        # Check for comma-separated tuple
-        elif len(value.strip().split(',')) > 1:
-            parts = [int(v) for v in value.strip().split(',')]
-            return tuple(parts)
-        
-        # Check for integer
-        elif value.isnumeric():
+        try:
+            # Check for comma-separated tuple
+            if ',' in value:
+                return tuple(int(v) for v in value.split(','))
+            # Check for integer (including negatives)
             return int(value)
+        except ValueError:
+            pass
         
-        # Check for float
-        elif ''.join(value.split('.')).isnumeric():
+        # Check for float (including exponent notation)
+        try:
             return float(value)
-        
-        else:
+        except ValueError:
             print(f"Unexpected value '{value}' in configuration file.")
             return None
 
@@ -275,11 +463,11 @@ def readConfig(cfile):
         'N': 100, 'I': 1, 'm': 4, 'de': 3, 'di': 5,
         'tpe': 0.01, 'tpi': 0.02, 'rp': 0.5,
         'vp': 0.9, 'mp': 0.3, 'ap': 0.3, 'ip': 0.4,
-        'max': 100, 'verbose': False, 'seed': seed()
+        'max': 100, 'verbose': False, 'seed': None
     }
 
     # Read configuration file if it exists
-    if isfile(cfile) and access(cfile, R_OK):
+    if mtime is not None:
         with open(cfile, 'r') as file:
             for line in file:
                 # Skip blank lines and comments
@@ -299,8 +487,44 @@ def readConfig(cfile):
                 
                 else:
                     print(f"Unexpected line '{parts[0]}' in configuration file.")
+
+    # Subgroup boundaries and mixing matrix, computed once for binnedSample
+    # and the kernels (a homogeneous population is a single subgroup mixing
+    # only with itself)
+    if type(config['N']) is tuple:
+        sizes = config['N']
+        config['_mix'] = np.array([config[g] for g in range(len(sizes))], dtype=np.int32)
+    else:
+        sizes = (config['N'],)
+        config['_mix'] = np.full((1, 1), 100, dtype=np.int32)
+    config['_mix'].flags.writeable = False
+    config['_bin_starts'] = tuple(accumulate([0] + list(sizes)))
     
-    return config
+    return MappingProxyType(config)
+
+
+_plt = None  # matplotlib.pyplot, imported by the first plot
+
+
+def pyplot():
+    """
+    Return matplotlib.pyplot, importing it on first use.
+    
+    The import is deferred so runs without visualization (e.g., simMany
+    replicas) never pay for it, and uses the headless Agg backend since
+    plots are only saved to file. If the caller has already imported
+    pyplot (e.g., in a notebook), its backend and open figures are kept.
+    """
+    global _plt
+    if _plt is None:
+        import sys
+        import matplotlib
+        # Switching backends would close the caller's figures
+        if 'matplotlib.pyplot' not in sys.modules:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
 
 
 def plotCurve(curve, config, stats=None):
@@ -311,7 +535,7 @@ def plotCurve(curve, config, stats=None):
     with peak marked and summary statistics displayed.
     
     Args:
-        curve (list): Daily infection counts
+        curve (ndarray): Daily infection counts
         config (dict): Configuration dictionary (for population size)
         stats (dict, optional): Statistics to display:
             - 'attack_rate': Percentage of population infected
@@ -327,17 +551,18 @@ def plotCurve(curve, config, stats=None):
         - Statistics box with key metrics
         - High-resolution (300 DPI) output
     """
+    plt = pyplot()
     plt.figure(figsize=(12, 6))
     
-    days = list(range(len(curve)))
+    days = np.arange(len(curve))
     
     # Plot main curve with shading
     plt.plot(days, curve, linewidth=2, color='#e74c3c', label='Active Infections')
     plt.fill_between(days, curve, alpha=0.3, color='#e74c3c')
     
     # Mark peak
-    peak_day = curve.index(max(curve))
-    peak_value = max(curve)
+    peak_day = int(curve.argmax())
+    peak_value = int(curve[peak_day])
     plt.plot(peak_day, peak_value, 'o', markersize=10, color='darkred',
              label=f'Peak: {peak_value} on day {peak_day}')
     
@@ -377,6 +602,106 @@ def plotCurve(curve, config, stats=None):
         print("(Continuing with simulation...)")
 
 
+def runSim(config):
+    """
+    Run one disease transmission simulation from a parsed configuration.
+    
+    This is the simulation core shared by sim() and simMany(); it does no
+    reporting beyond the per-day output enabled by config['verbose'].
+    
+    Args:
+        config (dict): Configuration dictionary as returned by readConfig
+        
+    Returns:
+        tuple: (curve, stats) where:
+            - curve is an ndarray[int32] of daily active infection counts
+            - stats is a dict with 'attack_rate', 'totinf', 'unique',
+              'reinfections' and 'extinguished'
+    """
+    if config['seed'] is not None:
+        s = seedInt(config['seed'])
+        seed(s)
+        # NumPy only takes seeds in [0, 2**32)
+        np.random.seed(s % 2**32)
+
+    pop, inf = newPop(config)
+
+    # Bind parameters used every day to locals once
+    di, de, rp = config['di'], config['de'], config['rp']
+    tpe, tpi, ap, ip = config['tpe'], config['tpi'], config['ap'], config['ip']
+    m, mix, verbose = config['m'], config['_mix'], config['verbose']
+
+    # Subgroup boundaries for the transmission kernel
+    bin_starts = np.array(config['_bin_starts'], dtype=np.int64)
+    sizes = np.diff(bin_starts)
+
+    # Contact counts per subgroup, specialized once for the population structure
+    if type(config['N']) is tuple:
+        def contactCounts(inf_idx):
+            """Split each agent's interactions across subgroups by its mixing row (rounded like round())."""
+            num_interactions = np.random.randint(0, m + 1, len(inf_idx), dtype=np.int64)
+            per_group = np.rint(num_interactions[:, None] * mix[pop.type[inf_idx]] / 100).astype(np.int64)
+            return np.minimum(per_group, sizes, out=per_group)
+    else:
+        def contactCounts(inf_idx):
+            """All of each agent's interactions are with the single population."""
+            num_interactions = np.random.randint(0, m + 1, (len(inf_idx), 1), dtype=np.int64)
+            return np.minimum(num_interactions, sizes[0], out=num_interactions)
+    
+    # Track statistics
+    totinf = int(inf.sum())  # Total infection events
+    ever_infected = inf.copy()  # Unique individuals infected
+    curve = np.empty(config['max'] + 1, dtype=np.int32)  # Daily active infection counts
+    curve[0] = totinf
+    extinguished = False
+
+    # Main simulation loop
+    for rounds in range(config['max']):
+        # Beginning-of-day status update
+        inf = update(pop, inf, rp)
+        day = rounds + 1
+        curve[day] = inf.sum()
+
+        if verbose:
+            print(f"Day {day}: {curve[day]} of {len(pop)} agents infected.")
+
+        # Check if epidemic has ended
+        if curve[day] == 0:
+            curve = curve[:day + 1]
+            extinguished = True
+            break
+
+        # Transmission phase: infected agents that aren't masked or
+        # isolated today interact with others
+        inf_idx = np.flatnonzero(inf).astype(np.int32)
+        n_inf = len(inf_idx)
+        spreading = inf_idx[
+            (np.random.randint(0, PROTECTION_SCALE, n_inf, dtype=np.uint8) >= pop.mask[inf_idx]) &
+            (np.random.randint(0, PROTECTION_SCALE, n_inf, dtype=np.uint8) >= pop.sociso[inf_idx])]
+        targets, sources = transmit(pop, spreading, contactCounts(spreading), bin_starts,
+                                    tpe, tpi, di, de, ap, ip)
+
+        if verbose:
+            for j, i in zip(targets, sources):
+                print(f"  Agent {j} infected by agent {i} [si={pop.sociso[j] / PROTECTION_SCALE:.2f}].")
+
+        # Add new infections to active set
+        totinf += len(targets)
+        ever_infected[targets] = True
+        inf[targets] = True
+
+    # Calculate final statistics
+    unique = int(ever_infected.sum())
+    stats = {
+        'attack_rate': (100 * unique) / len(pop),
+        'totinf': totinf,
+        'unique': unique,
+        'reinfections': totinf - unique,
+        'extinguished': extinguished
+    }
+    return curve, stats
+
+
 def sim(cfile='Example(Subgroups).cfg', visualize=True):
     """
     Run disease transmission simulation.
@@ -389,7 +714,7 @@ def sim(cfile='Example(Subgroups).cfg', visualize=True):
         visualize (bool): Whether to generate epidemic curve visualization
         
     Returns:
-        list: Epidemic curve showing daily active infection counts
+        ndarray[int32]: Epidemic curve showing daily active infection counts
         
     Simulation Process:
         1. Read configuration and create population
@@ -402,10 +727,10 @@ def sim(cfile='Example(Subgroups).cfg', visualize=True):
         4. Report statistics and optionally generate visualization
         
     Disease State Model:
-        - state = -1: Susceptible
         - state = 0: Recovered (immune)
-        - state = 1 to di: Infected period (symptomatic)
-        - state = di+1 to di+de: Exposed period (pre-symptomatic)
+        - state = 1: Susceptible
+        - state = 2 to di+1: Infected period (symptomatic)
+        - state = di+2 to di+de+1: Exposed period (pre-symptomatic)
         
     Protection Layers:
         Agents are protected from infection by:
@@ -421,141 +746,62 @@ def sim(cfile='Example(Subgroups).cfg', visualize=True):
         - Unique agents infected (attack rate)
         - Number of reinfections
     """
-    def susceptible(i):
-        """Check if agent i is susceptible to infection."""
-        return (pop[i]['state'] == -1 and
-                not flip(pop[i]['vaccine']) and
-                not flip(pop[i]['mask']) and
-                not flip(pop[i]['natural_immunity']))
-
-    def exposed(i):
-        """Check if agent i is in exposed state (infectious but pre-symptomatic)."""
-        return config['di'] < pop[i]['state'] <= config['di'] + config['de']
-
-    def infected(i):
-        """Check if agent i is in infected state (symptomatic and infectious)."""
-        return 0 < pop[i]['state'] <= config['di']
-
-    def infectious(i):
-        """Check if agent i can spread disease (exposed or infected, not masked/isolated)."""
-        return (0 < pop[i]['state'] <= config['di'] + config['de'] and
-                not flip(pop[i]['mask']) and
-                not flip(pop[i]['sociso']))
-
-    def recovered(i):
-        """Check if agent i has recovered with immunity."""
-        return pop[i]['state'] == 0
-
-    # Initialize simulation
     config = readConfig(cfile)
+    curve, stats = runSim(config)
+
+    total_pop = config['_bin_starts'][-1]
+    outcome = 'extinguished' if stats['extinguished'] else 'persists'
+    print(f"Pandemic {outcome}: {len(curve)-1} days, {stats['totinf']} total infection events.")
+    print(f"  Unique agents infected: {stats['unique']} of {total_pop} ({stats['attack_rate']:.1f}% attack rate)")
+    if stats['reinfections'] > 0:
+        print(f"  Reinfections: {stats['reinfections']} ({(100*stats['reinfections'])/stats['totinf']:.1f}% of total events)")
+
+    # Generate visualization
+    if visualize:
+        plotCurve(curve, config, stats)
     
-    if 'seed' in config:
-        seed(config['seed'])
+    return curve
 
-    pop, inf = newPop(config)
-    
-    # Track statistics
-    totinf = len(inf)  # Total infection events
-    ever_infected = set(inf)  # Unique individuals infected
-    curve = [totinf]  # Daily active infection counts
 
-    # Main simulation loop
-    rounds = 0
-    while rounds < config['max']:
-        # Beginning-of-day status update
-        inf = update(pop, inf, config)
-        curve.append(len(inf))
+def _runOne(args):
+    """Run one replica for simMany (top level so worker processes can pickle it)."""
+    rep, config = args
+    curve, stats = runSim(config)
+    return rep, curve, stats
 
-        if config['verbose']:
-            print(f"Day {len(curve)-1}: {curve[-1]} of {len(pop)} agents infected.")
 
-        # Check if epidemic has ended
-        if curve[-1] == 0:
-            # Calculate final statistics
-            attack_rate = (100 * len(ever_infected)) / len(pop)
-            reinfection_rate = totinf - len(ever_infected)
-            
-            print(f"Pandemic extinguished: {len(curve)-1} days, {totinf} total infection events.")
-            print(f"  Unique agents infected: {len(ever_infected)} of {len(pop)} ({attack_rate:.1f}% attack rate)")
-            if reinfection_rate > 0:
-                print(f"  Reinfections: {reinfection_rate} ({(100*reinfection_rate)/totinf:.1f}% of total events)")
-            
-            # Generate visualization
-            if visualize:
-                stats = {
-                    'attack_rate': attack_rate,
-                    'totinf': totinf,
-                    'reinfections': reinfection_rate
-                }
-                plotCurve(curve, config, stats)
-            
-            break
-
-        # Transmission phase: infected agents interact with others
-        newinf = set()
-        for i in inf:
-            # Determine who agent i interacts with today
-            if type(config['N']) is tuple:
-                # Heterogeneous mixing based on agent's subgroup
-                num_interactions = randint(0, config['m'])
-                # Calculate interactions per subgroup based on mixing matrix
-                interactions_per_group = tuple([
-                    round((num_interactions * pct) / 100)
-                    for pct in config[pop[i]['type']]
-                ])
-                interactions = binnedSample(interactions_per_group, config['N'])
-            else:
-                # Homogeneous mixing
-                interactions = sample(range(len(pop)), randint(0, config['m']))
-            
-            # Attempt transmission to each interaction
-            for j in interactions:
-                # Check all conditions for transmission
-                if (infectious(i) and susceptible(j) and
-                    ((exposed(i) and flip(config['tpe'])) or
-                     (infected(i) and flip(config['tpi'])))):
-                    
-                    # New infection occurs
-                    totinf += 1
-                    ever_infected.add(j)
-                    pop[j]['state'] = config['di'] + config['de'] + 1
-
-                    # Set social isolation for newly infected agent
-                    if flip(config['ap']):
-                        # Asymptomatic - won't isolate
-                        pop[j]['sociso'] = 0
-                    else:
-                        # Symptomatic - may choose to isolate
-                        pop[j]['sociso'] = ((flip(config['ip']) and random()) or 0)
-
-                    if config['verbose']:
-                        print(f"  Agent {j} infected by agent {i} [si={pop[j]['sociso']:.2f}].")
-                    
-                    newinf.add(j)
-
-        # Add new infections to active set
-        inf.update(newinf)
-        rounds += 1
+def simMany(reps, cfile='Example(Subgroups).cfg', processes=None):
+    """
+    Run independent replicas of the simulation across CPU cores.
     
-    else:
-        # Simulation reached max rounds without extinction
-        attack_rate = (100 * len(ever_infected)) / len(pop)
-        reinfection_rate = totinf - len(ever_infected)
-        
-        print(f"Pandemic persists: {len(curve)-1} days, {totinf} total infection events.")
-        print(f"  Unique agents infected: {len(ever_infected)} of {len(pop)} ({attack_rate:.1f}% attack rate)")
-        if reinfection_rate > 0:
-            print(f"  Reinfections: {reinfection_rate} ({(100*reinfection_rate)/totinf:.1f}% of total events)")
-        
-        if visualize:
-            stats = {
-                'attack_rate': attack_rate,
-                'totinf': totinf,
-                'reinfections': reinfection_rate
-            }
-            plotCurve(curve, config, stats)
+    The configuration is read once; replica r is seeded with seed + r (or
+    with a random base seed if the configuration doesn't set one), so an
+    ensemble is reproducible whenever a single run is.
     
-    return curve
+    Args:
+        reps (int): Number of replicas to run
+        cfile (str): Path to configuration file
+        processes (int, optional): Worker processes (default: CPU count)
+        
+    Returns:
+        tuple: (curves, stats) where:
+            - curves is a (reps, max+1) ndarray[int32] of daily active
+              infections, zero-padded after a replica's epidemic ends
+            - stats is a list of per-replica statistics dicts (see runSim)
+    """
+    config = readConfig(cfile)
+    base = seedInt(config['seed']) if config['seed'] is not None else np.random.randint(2**31)
+
+    curves = np.zeros((reps, config['max'] + 1), dtype=np.int32)
+    stats = [None] * reps
+    # Each job gets a plain (picklable) copy of the configuration
+    jobs = [(rep, dict(config, seed=base + rep)) for rep in range(reps)]
+    with Pool(processes) as pool:
+        for rep, curve, rep_stats in pool.imap_unordered(_runOne, jobs):
+            curves[rep, :len(curve)] = curve
+            stats[rep] = rep_stats
+
+    return curves, stats
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled contact sampling for the Disease Transmission Simulator.
+
+Cython counterpart of floydSample/drawContacts in Disease Simulation.py.
+Build it ahead of time in this directory with
+
+    cythonize -i disease_core.pyx
+
+(needs Cython and a C compiler); the simulator then imports it in place of
+the numba/Python version. It has no per-process JIT warmup, which matters
+for short ensemble replicas. The uniform draws still come from NumPy, so
+results match the other backends exactly for a given seed.
+
+Author: pospsl
+"""
+
+import numpy as np
+from libc.stdint cimport int64_t
+
+
+cdef void floydSample(Py_ssize_t k, Py_ssize_t n, const double[::1] u,
+                      int64_t[::1] out, Py_ssize_t first) noexcept nogil:
+    """Sample k distinct integers from range(n) into out[first:first+k] (Floyd's algorithm)."""
+    cdef Py_ssize_t c, d, j, t
+    for c in range(k):
+        j = n - k + c
+        t = <Py_ssize_t>(u[first + c] * (j + 1))
+        # t is taken already: j itself can't be, so use it instead
+        for d in range(first, first + c):
+            if out[d] == t:
+                t = j
+                break
+        out[first + c] = t
+
+
+def drawContacts(const int64_t[:, ::1] per_group, const int64_t[::1] bin_starts,
+                 const double[::1] u):
+    """
+    Draw every contact made today, without replacement within each subgroup.
+
+    Args:
+        per_group (ndarray[int64]): (sources, G) contacts each source agent
+            makes with each subgroup today
+        bin_starts (ndarray[int64]): First agent index of each subgroup, plus N
+        u (ndarray[float]): One uniform draw per contact (per_group.sum() total)
+
+    Returns:
+        ndarray[int64]: Contacted agents, grouped by source agent in order
+    """
+    contacts = np.empty(u.shape[0], dtype=np.int64)
+    cdef int64_t[::1] out = contacts
+    cdef Py_ssize_t k, g, c, count, first = 0
+
+    # No Python objects below; a prange over sources could replace the
+    # outer loop once per-source offsets are precomputed
+    with nogil:
+        for k in range(per_group.shape[0]):
+            for g in range(per_group.shape[1]):
+                count = per_group[k, g]
+                floydSample(count, bin_starts[g + 1] - bin_starts[g], u, out, first)
+                for c in range(first, first + count):
+                    out[c] += bin_starts[g]
+                first += count
+    return contacts